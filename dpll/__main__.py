@@ -0,0 +1,70 @@
+"""
+Lightweight command line entry point, meant for running the solver on many small instances:
+    python -m dpll [--backend=bitset|cnf] FILE [FILE ...]
+    python -m dpll [--backend=bitset|cnf] -     (reads one path per line from stdin)
+Prints one line per instance: the path, SAT or UNSAT and, for SAT instances, the model in DIMACS notation.
+Instances that cannot be read get the line path, ERROR and the error message, and the remaining ones are still solved.
+Only the standard library is imported with the (default) bitset backend.
+"""
+import sys
+
+from dpll.dpll import DPLL, clause_operations, model_dict_to_list
+
+USAGE = __doc__.strip().splitlines()[1:3]
+
+
+def solve_file(path, backend):
+    """
+    Solves the instance in path and returns its output line
+    :param path: path to a .cnf file
+    :param backend: 'bitset' or 'cnf'
+    :return:
+    """
+    solver = DPLL(cnf_file=path, backend=backend)
+    model = solver.solve()
+    if model is None:
+        return f'{path}\tUNSAT'
+    return f'{path}\tSAT\t' + ' '.join([str(x) for x in model_dict_to_list(solver.formula.nv, model)])
+
+
+def main(args):
+    """
+    Parses the arguments and solves the requested instances
+    :param args: command line arguments (without the program name)
+    :return: exit status
+    """
+    backend = 'bitset'
+    paths = []
+    for arg in args:
+        if arg.startswith('--backend='):
+            backend = arg[len('--backend='):]
+        elif arg.startswith('-') and arg != '-':
+            print('usage:', *USAGE, sep='\n', file=sys.stderr)
+            return 2
+        else:
+            paths.append(arg)
+    if not paths:
+        print('usage:', *USAGE, sep='\n', file=sys.stderr)
+        return 2
+    try:
+        clause_operations(backend)
+    except ValueError as e:
+        print(e, 'usage:', *USAGE, sep='\n', file=sys.stderr)
+        return 2
+
+    for path in paths:
+        # '-' keeps the process alive, solving the paths read from stdin as they arrive
+        lines = (line.strip() for line in sys.stdin) if path == '-' else [path]
+        for p in lines:
+            if p:
+                try:
+                    line = solve_file(p, backend)
+                except (OSError, ValueError) as e:
+                    line = f'{p}\tERROR\t{e}'
+                sys.stdout.write(line + '\n')
+                sys.stdout.flush()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,161 @@
+"""
+asyncio interface to DPLL, for embedding the solver in services without blocking their event loop
+"""
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from dpll.dpll import DPLL, SearchInterrupted
+
+
+class AsyncDPLL:
+    def __init__(self, max_concurrency=4, use_processes=False, progress_interval=0.5):
+        """
+        Creates a pool that runs DPLL searches in worker threads or processes.
+        Requests beyond max_concurrency wait in a queue until a worker is free
+        :param max_concurrency: maximum number of searches running at the same time
+        :param use_processes: whether searches run in processes (true parallelism, but arguments must be picklable) instead of threads
+        :param progress_interval: seconds between calls to the progress callback of solve()
+        """
+        self.max_concurrency = max_concurrency
+        self.use_processes = use_processes
+        self.progress_interval = progress_interval
+        pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.executor = pool_class(max_workers=max_concurrency)
+        # provides the events that stop searches running in worker processes and the dicts where they report their statistics
+        self.manager = multiprocessing.Manager() if use_processes else None
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.queued = 0  # requests waiting for a worker
+        self.running = 0  # searches in progress
+
+    async def solve(self, cnf_file=None, formula=None, timeout=None, progress=None, **solver_args):
+        """
+        Runs DPLL.solve in a worker and returns its result and statistics.
+        If the request is cancelled or times out, the search is interrupted, and its
+        worker is only given to another request once the search has actually stopped
+        :param cnf_file: path to a .cnf file
+        :param formula: pysat.formula.CNF instance
+        :param timeout: maximum number of seconds of search (not counting the time in the queue), asyncio.TimeoutError is raised when exceeded
+        :param progress: function called every progress_interval seconds with a copy of the solver statistics
+        :param solver_args: other DPLL arguments (backend, choice_function, etc.)
+        :return: tuple(model, statistics), where model is the result of DPLL.solve
+        """
+        self.queued += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.running += 1
+        try:
+            if self.use_processes:
+                return await self.__solve_in_process(cnf_file, formula, timeout, progress, solver_args)
+            return await self.__solve_in_thread(cnf_file, formula, timeout, progress, solver_args)
+        finally:
+            self.running -= 1
+            self.semaphore.release()
+
+    async def close(self):
+        """
+        Shuts the workers down, cancelling the searches that did not start yet
+        :return:
+        """
+        await asyncio.get_running_loop().run_in_executor(
+            None, partial(self.executor.shutdown, wait=True, cancel_futures=True)
+        )
+        if self.manager is not None:
+            self.manager.shutdown()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def __solve_in_thread(self, cnf_file, formula, timeout, progress, solver_args):
+        loop = asyncio.get_running_loop()
+        # parsing the file might take a while too, so the solver is created in the worker
+        solver = await loop.run_in_executor(
+            self.executor, partial(DPLL, cnf_file=cnf_file, formula=formula, **solver_args)
+        )
+        search = loop.run_in_executor(self.executor, solver.solve)
+        # the search raises SearchInterrupted if we give up on it, which nobody awaits
+        search.add_done_callback(lambda s: s.cancelled() or s.exception())
+
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        try:
+            while True:
+                wait = self.progress_interval
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                done, _ = await asyncio.wait({search}, timeout=max(wait, 0))
+                if done:
+                    return search.result(), dict(solver.statistics)
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise asyncio.TimeoutError()
+                if progress is not None:
+                    progress(dict(solver.statistics))
+        except BaseException:
+            solver.interrupt()
+            await asyncio.wait({search})
+            raise
+
+    async def __solve_in_process(self, cnf_file, formula, timeout, progress, solver_args):
+        loop = asyncio.get_running_loop()
+        stop_event = self.manager.Event()
+        statistics = self.manager.dict() if progress is not None else None
+        search = loop.run_in_executor(self.executor, partial(
+            solve_with_statistics, cnf_file, formula, timeout, solver_args, stop_event, statistics, self.progress_interval
+        ))
+        search.add_done_callback(lambda s: s.cancelled() or s.exception())
+        try:
+            # asyncio.wait does not cancel the search when the request is cancelled, so we can still stop it below
+            while True:
+                done, _ = await asyncio.wait({search}, timeout=self.progress_interval if progress is not None else None)
+                if done:
+                    return search.result()
+                snapshot = dict(statistics)
+                if snapshot:
+                    progress(snapshot)
+        except SearchInterrupted:
+            raise asyncio.TimeoutError()
+        except BaseException:
+            stop_event.set()
+            await asyncio.wait({search})
+            raise
+
+def solve_with_statistics(cnf_file, formula, time_limit, solver_args, stop_event=None, statistics=None,
+                          progress_interval=0.5):
+    """
+    Creates a DPLL instance, solves it and returns the model with the statistics
+    (module-level function, so that it can be sent to worker processes)
+    :param cnf_file: path to a .cnf file
+    :param formula: pysat.formula.CNF instance
+    :param time_limit: maximum number of seconds of search
+    :param solver_args: other DPLL arguments
+    :param stop_event: event that interrupts the search when set
+    :param statistics: dict (e.g. a multiprocessing.Manager dict) updated with the solver statistics every progress_interval seconds during the search
+    :param progress_interval: seconds between updates of statistics
+    :return: tuple(model, statistics)
+    """
+    solver = DPLL(cnf_file=cnf_file, formula=formula, time_limit=time_limit, stop_event=stop_event, **solver_args)
+    if statistics is None:
+        return solver.solve(), solver.statistics
+
+    # the search holds the worker's main thread, so the reports come from another one
+    finished = threading.Event()
+
+    def report():
+        while not finished.wait(progress_interval):
+            statistics.update(solver.statistics)
+
+    reporter = threading.Thread(target=report, daemon=True)
+    reporter.start()
+    try:
+        return solver.solve(), solver.statistics
+    finally:
+        finished.set()
+        reporter.join()
@@ -0,0 +1,174 @@
+"""
+Bitset representation of CNF formulas, meant for formulas with few variables.
+Each clause is a tuple (pos, neg) of Python ints, where bit v of pos (resp. neg)
+is set if variable v occurs asserted (resp. negated) in the clause.
+The functions in this module mirror the clause-handling functions of dpll.dpll,
+so that DPLL and DPLLCount can use either representation (see their backend parameter).
+"""
+
+
+class BitsetFormula:
+    def __init__(self, nv=0, clauses=None):
+        """
+        Creates a formula from already encoded clauses
+        :param nv: number of variables
+        :param clauses: list of (pos, neg) tuples
+        """
+        self.nv = nv
+        self.clauses = clauses if clauses is not None else []
+
+    @classmethod
+    def from_clauses(cls, clauses, nv=None):
+        """
+        Creates a formula from a list of clauses in DIMACS notation.
+        Tautologies are discarded, as a clause with both polarities of a single
+        variable would otherwise look like a unit clause
+        :param clauses: list of lists of literals
+        :param nv: number of variables (computed from the clauses if None)
+        :return:
+        """
+        if nv is None:
+            nv = max([abs(l) for c in clauses for l in c], default=0)
+        encoded = [encode_clause(c) for c in clauses]
+        return cls(nv, [(pos, neg) for pos, neg in encoded if not pos & neg])
+
+    @classmethod
+    def from_cnf(cls, cnf):
+        """
+        Creates a formula from a pysat.formula.CNF instance
+        :param cnf:
+        :return:
+        """
+        return cls.from_clauses(cnf.clauses, cnf.nv)
+
+    def copy(self):
+        """
+        Returns a copy of this formula. Clauses are immutable, so only the list is copied
+        :return:
+        """
+        return BitsetFormula(self.nv, list(self.clauses))
+
+    def to_clauses(self):
+        """
+        Returns the clauses of this formula as lists of literals in DIMACS notation
+        :return:
+        """
+        return [decode_clause(c) for c in self.clauses]
+
+
+def encode_clause(clause):
+    """
+    Converts a clause in DIMACS notation to a (pos, neg) tuple
+    :param clause: list of literals
+    :return:
+    """
+    pos, neg = 0, 0
+    for l in clause:
+        if l > 0:
+            pos |= 1 << l
+        else:
+            neg |= 1 << -l
+    return pos, neg
+
+
+def decode_clause(clause):
+    """
+    Converts a (pos, neg) tuple to a clause in DIMACS notation (sorted by variable)
+    :param clause:
+    :return:
+    """
+    pos, neg = clause
+    literals = []
+    for v in range(1, max(pos, neg).bit_length()):
+        if pos >> v & 1:
+            literals.append(v)
+        if neg >> v & 1:
+            literals.append(-v)
+    return literals
+
+
+def unit_clause(l):
+    """
+    Returns the unit clause with literal l
+    :param l:
+    :return:
+    """
+    return (1 << l, 0) if l > 0 else (0, 1 << -l)
+
+
+def count_removed_literals(clauses, l):
+    """
+    Returns how many occurrences of ~l the unit propagation of l removes,
+    i.e., the number of clauses with ~l that do not contain l
+    :param clauses: list of (pos, neg) tuples
+    :param l:
+    :return:
+    """
+    if l > 0:
+        bit = 1 << l
+        return len([1 for pos, neg in clauses if neg & bit and not pos & bit])
+    bit = 1 << -l
+    return len([1 for pos, neg in clauses if pos & bit and not neg & bit])
+
+
+def has_empty_clause(clauses):
+    """
+    Returns whether any of the clauses is empty
+    :param clauses: list of (pos, neg) tuples
+    :return:
+    """
+    return (0, 0) in clauses
+
+
+def unit_propagation(f, l):
+    """
+    Performs unit propagation of literal l in formula f.
+    That is, removes all clauses with l and removes ~l from the clauses it occurs
+    :param f: BitsetFormula
+    :param l:
+    :return: a new BitsetFormula
+    """
+    if l > 0:
+        bit = 1 << l
+        clauses = [(pos, neg & ~bit) for pos, neg in f.clauses if not pos & bit]
+    else:
+        bit = 1 << -l
+        clauses = [(pos & ~bit, neg) for pos, neg in f.clauses if not neg & bit]
+    return BitsetFormula(f.nv, clauses)
+
+
+def find_single_polarity(clauses, excluded=()):
+    """
+    Returns one literal that occurs with a single polarity
+    in the formula, or None if none is found
+    :param clauses: list of (pos, neg) tuples
+    :param excluded: container of literals that must not be returned
+    :return:
+    """
+    all_pos, all_neg = 0, 0
+    for pos, neg in clauses:
+        all_pos |= pos
+        all_neg |= neg
+
+    for pure, sign in ((all_pos & ~all_neg, 1), (all_neg & ~all_pos, -1)):
+        while pure:
+            lowest = pure & -pure
+            lit = sign * (lowest.bit_length() - 1)
+            if lit not in excluded:
+                return lit
+            pure ^= lowest
+    return None
+
+
+def find_unit_clause(clauses):
+    """
+    Returns the literal of the first unit clause found
+    Returns None if there are no unit clauses
+    :param clauses: list of (pos, neg) tuples
+    :return:
+    """
+    for pos, neg in clauses:
+        bits = pos | neg
+        if bits and not bits & (bits - 1):
+            return bits.bit_length() - 1 if pos else 1 - bits.bit_length()
+    return None
@@ -0,0 +1,167 @@
+"""
+Clausal encodings of cardinality constraints.
+All literals are in DIMACS notation. Encodings that require auxiliary variables
+receive the largest variable index in use (top) and return the generated clauses
+together with the new largest index, so that calls can be chained:
+    clauses, top = at_most_k(lits1, 2, top)
+    more, top = exactly_one(lits2, top)
+"""
+
+ENCODINGS = ('pairwise', 'sequential', 'commander', 'totalizer')
+
+
+def at_most_one_pairwise(literals):
+    """
+    Encodes that at most one of the literals is true with O(n^2) binary clauses
+    and no auxiliary variables
+    :param literals: list of literals
+    :return: list of clauses
+    """
+    n = len(literals)
+    return [[-literals[i], -literals[j]] for i in range(n) for j in range(i+1, n)]
+
+
+def at_most_k_sequential(literals, k, top):
+    """
+    Encodes that at most k of the literals are true with the sequential counter
+    of Sinz (2005): O(n*k) clauses and auxiliary variables.
+    Register s(i, j) is true if at least j+1 of the first i+1 literals are true.
+    :param literals: list of literals
+    :param k: maximum number of true literals
+    :param top: largest variable index in use
+    :return: tuple(list of clauses, new largest variable index)
+    """
+    n = len(literals)
+    if k >= n:
+        return [], top
+    if k == 0:
+        return [[-x] for x in literals], top
+
+    # registers of the first n-1 literals (the last one only needs to be checked against them)
+    s = [[top + i*k + j + 1 for j in range(k)] for i in range(n - 1)]
+    top += (n - 1) * k
+
+    clauses = [[-literals[0], s[0][0]]]
+    clauses += [[-s[0][j]] for j in range(1, k)]
+    for i in range(1, n - 1):
+        x = literals[i]
+        clauses.append([-x, s[i][0]])
+        clauses.append([-s[i-1][0], s[i][0]])
+        for j in range(1, k):
+            clauses.append([-x, -s[i-1][j-1], s[i][j]])
+            clauses.append([-s[i-1][j], s[i][j]])
+        clauses.append([-x, -s[i-1][k-1]])
+    clauses.append([-literals[n-1], -s[n-2][k-1]])
+    return clauses, top
+
+
+def at_most_one_commander(literals, top, group_size=3):
+    """
+    Encodes that at most one of the literals is true with the commander encoding
+    of Klieber & Kwon (2007). Literals are split in groups, each group gets a commander
+    variable that is true iff some literal of the group is true, and the commanders are
+    recursively constrained until few enough remain for the pairwise encoding.
+    :param literals: list of literals
+    :param top: largest variable index in use
+    :param group_size: number of literals under each commander
+    :return: tuple(list of clauses, new largest variable index)
+    """
+    if group_size < 2:
+        raise ValueError('group_size must be at least 2')
+    if len(literals) <= group_size + 1:
+        return at_most_one_pairwise(literals), top
+
+    clauses = []
+    commanders = []
+    for start in range(0, len(literals), group_size):
+        group = literals[start:start + group_size]
+        top += 1
+        c = top
+        commanders.append(c)
+        clauses += at_most_one_pairwise(group)
+        clauses.append([-c] + group)            # commander true -> some literal of the group is true
+        clauses += [[-x, c] for x in group]     # some literal of the group is true -> commander true
+
+    more, top = at_most_one_commander(commanders, top, group_size)
+    return clauses + more, top
+
+
+def at_most_k_totalizer(literals, k, top):
+    """
+    Encodes that at most k of the literals are true with the totalizer of
+    Bailleux & Boufkhad (2003), whose nodes count in unary the true literals below them.
+    Counters are truncated at k+1, so the encoding has O(n*k) variables and O(n*k^2) clauses.
+    :param literals: list of literals
+    :param k: maximum number of true literals
+    :param top: largest variable index in use
+    :return: tuple(list of clauses, new largest variable index)
+    """
+    n = len(literals)
+    if k >= n:
+        return [], top
+    if k == 0:
+        return [[-x] for x in literals], top
+
+    clauses = []
+
+    def build(lits):
+        """
+        Returns the unary counter (list of output variables) of lits.
+        The i-th output (0-based) is true if at least i+1 literals in lits are true
+        """
+        nonlocal top
+        if len(lits) == 1:
+            return [lits[0]]
+        left = build(lits[:len(lits) // 2])
+        right = build(lits[len(lits) // 2:])
+        outputs = list(range(top + 1, top + 1 + min(len(lits), k + 1)))
+        top += len(outputs)
+        # left has i true and right has j true -> at least i+j true
+        for i in range(len(left) + 1):
+            for j in range(len(right) + 1):
+                if 0 < i + j <= len(outputs):
+                    clause = [outputs[i + j - 1]]
+                    if i > 0:
+                        clause.append(-left[i - 1])
+                    if j > 0:
+                        clause.append(-right[j - 1])
+                    clauses.append(clause)
+        return outputs
+
+    root = build(literals)
+    clauses.append([-root[k]])
+    return clauses, top
+
+
+def at_most_k(literals, k, top, encoding='sequential'):
+    """
+    Encodes that at most k of the literals are true
+    :param literals: list of literals
+    :param k: maximum number of true literals
+    :param top: largest variable index in use
+    :param encoding: one of ENCODINGS ('pairwise' and 'commander' only support k=1)
+    :return: tuple(list of clauses, new largest variable index)
+    """
+    if encoding == 'sequential':
+        return at_most_k_sequential(literals, k, top)
+    if encoding == 'totalizer':
+        return at_most_k_totalizer(literals, k, top)
+    if encoding not in ENCODINGS:
+        raise ValueError(f'Unknown encoding {encoding}, please choose one of {ENCODINGS}')
+    if k != 1:
+        raise ValueError(f'The {encoding} encoding only supports k=1')
+    if encoding == 'pairwise':
+        return at_most_one_pairwise(literals), top
+    return at_most_one_commander(literals, top)
+
+
+def exactly_one(literals, top, encoding='sequential'):
+    """
+    Encodes that exactly one of the literals is true
+    :param literals: list of literals
+    :param top: largest variable index in use
+    :param encoding: one of ENCODINGS
+    :return: tuple(list of clauses, new largest variable index)
+    """
+    clauses, top = at_most_k(literals, 1, top, encoding)
+    return [list(literals)] + clauses, top
@@ -1,23 +1,63 @@
 from copy import copy, deepcopy
 import itertools
+import sys
+import time
 
-import fire
-from pysat.formula import CNF
+# number of branches between checks of the stop event of DPLL
+STOP_EVENT_POLL_INTERVAL = 64
+
+
+class SearchInterrupted(Exception):
+    """
+    Raised by DPLL.solve when the search is interrupted or runs out of time
+    """
+    pass
 
 
 class DPLL:
-    def __init__(self, cnf_file=None, formula=None, choice_function=None):
+    def __init__(self, cnf_file=None, formula=None, choice_function=None, at_most=None, backend='cnf',
+                 proof=None, binary_proof=False, time_limit=None, stop_event=None):
         """
         Creates a DPLL search instances. Either the cnf_file or the formula must be supplied
         :param cnf_file: path to a .cnf file
-        :param formula: pysat.formula.CNF instance
+        :param formula: pysat.formula.CNF instance (or dpll.bitset.BitsetFormula with the bitset backend)
         :param choice_function: function that receives a formula (pysat.formula.CNF) and a model (dict(var->assignment in DIMACS notation)) and chooses the next literal to branch on
+        :param at_most: list of (literals, k) pairs, each one a native constraint stating that at most k of the literals are true. They are propagated directly by the solver instead of being encoded as clauses (see dpll.cardinality for the clausal encodings)
+        :param backend: formula representation used during the search, 'cnf' (pysat.formula.CNF) or 'bitset' (dpll.bitset.BitsetFormula, faster on formulas with few variables). The choice function receives formulas in this representation
+        :param proof: path or binary file object where a DRAT proof is written as the search runs. When the formula is UNSAT, the proof ends with the empty clause. Pure literal elimination is disabled, as it does not produce DRAT lemmas
+        :param binary_proof: whether the proof is written in binary DRAT format
+        :param time_limit: maximum number of seconds for solve(), which raises SearchInterrupted when it is exceeded
+        :param stop_event: object with an is_set() method (e.g. a threading or multiprocessing.Manager Event), checked like interrupt(), but only every STOP_EVENT_POLL_INTERVAL branches, as is_set() may be a round trip to another process. Allows stopping a search that runs in another process
         """
         if cnf_file is None and formula is None:
             raise ValueError('Please provide either a cnf file or a formula')
         self.choose_literal = choice_function if choice_function is not None else choose_random_literal
 
-        self.formula = formula if formula is not None else CNF(from_file=cnf_file)
+        # functions that handle the clauses in the chosen representation
+        self.ops = clause_operations(backend)
+        self.formula = load_formula(backend, cnf_file, formula)
+
+        # native cardinality constraints and, for each literal, the constraints it occurs in
+        self.at_most = [(list(lits), k) for lits, k in at_most] if at_most is not None else []
+        self.at_most_occurrences = {}
+        for i, (lits, k) in enumerate(self.at_most):
+            for x in lits:
+                self.at_most_occurrences.setdefault(x, []).append(i)
+
+        # variables that occur only in the constraints must be part of the model as well
+        constrained_nv = max([abs(x) for x in self.at_most_occurrences], default=0)
+        if constrained_nv > self.formula.nv:
+            self.formula = self.formula.copy()
+            self.formula.nv = constrained_nv
+
+        if proof is not None and self.at_most:
+            raise ValueError('Proofs are not supported with native constraints, please encode them as clauses (see dpll.cardinality)')
+        self.proof = proof
+        self.binary_proof = binary_proof
+        self.proof_writer = None
+        self.purify = proof is None
+        self.decisions = []  # literals branched on to reach the current node
+        self.lemmas = []  # lemmas written to the proof and not deleted yet
 
         self.statistics = {
             'branches': 0,
@@ -30,6 +70,19 @@ class DPLL:
         self.solved = False
         self.model = None
 
+        self.time_limit = time_limit
+        self.deadline = None
+        self.interrupted = False
+        self.stop_event = stop_event
+
+    def interrupt(self):
+        """
+        Requests a running solve() to stop, which it does by raising SearchInterrupted at the next branch.
+        Can be called from another thread. The search cannot be resumed afterwards
+        :return:
+        """
+        self.interrupted = True
+
     def solve(self):
         """
         Computes a solution using the DPLL algorithm and returns it.
@@ -37,10 +90,20 @@ class DPLL:
         a partial assignment of values to the variables.
         For example, {1: -1, 3: 3, 4: -4} means that x1=F, x2 is undetermined, x3=T, x4=F.
         Undetermined variables can be either T or F
+        Raises SearchInterrupted if interrupt() is called or the time limit is exceeded during the search
         :return:
         """
         if not self.solved:
-            self.model = self.__dpll(self.formula, {})
+            if self.time_limit is not None:
+                self.deadline = time.monotonic() + self.time_limit
+            if self.proof is None:
+                self.model = self.__dpll(self.formula, {})
+            else:
+                from dpll.proof import DRATWriter
+                with DRATWriter(self.proof, self.binary_proof) as self.proof_writer:
+                    self.model = self.__dpll(self.formula, {})
+                    if self.model is None:
+                        self.proof_writer.add([])  # the empty clause concludes the refutation
             self.solved = True
         return self.model
 
@@ -73,46 +136,228 @@ class DPLL:
         :param model: partial assignment (dict)
         :return:
         """
-        # an empty formula is satisfiable
-        if len(f.clauses) == 0:
-            return model
-
-        # if any clause is empty, the formula is UNSAT
-        if any([len(c) == 0 for c in f.clauses]):
-            return None
-
         # trying to use a 'local' variables
         model = copy(model)
         f = f.copy()
         # print(partial_model_dict_to_list(f.nv, model))
 
-        # unit propagation if f contains a unit clause
-        l = find_unit_clause(f.clauses)
-        if l is not None:
-            model[abs(l)] = l  # adds the literal to its index in the model
-            f = unit_propagation(f, l)
-            return self.__dpll(f, model)
-
-        # purification: if f contains a literal with single polarity, set it up to provoke unit propagations
-        l = find_single_polarity(f.clauses)
-        if l is not None:
-            # adds a unit clause with l to f to trigger unit propagation
-            f.clauses.append([l])
-            return self.__dpll(f, model)
+        # unit propagations and purifications are done in a loop rather than by recursion,
+        # so that long chains of them (e.g. the literals forced by native constraints) do not exhaust the stack
+        while True:
+            # an empty formula is satisfiable, as long as the free literals
+            # of the native constraints are set to false
+            if len(f.clauses) == 0:
+                return self.__falsify_constrained_literals(f, model)
+
+            # if any clause is empty, the formula is UNSAT
+            if self.ops.has_empty_clause(f.clauses):
+                return None
+
+            # unit propagation if f contains a unit clause
+            l = self.ops.find_unit_clause(f.clauses)
+            if l is not None:
+                model[abs(l)] = l  # adds the literal to its index in the model
+                n_clauses = len(f.clauses)
+                self.statistics['up_literals_cleaned'] += self.ops.count_removed_literals(f.clauses, l)
+                f = self.ops.unit_propagation(f, l)
+                self.statistics['unit_propagations'] += 1
+                self.statistics['up_clauses_cleaned'] += n_clauses - len(f.clauses)
+                if l in self.at_most_occurrences:
+                    forced = self.__propagate_at_most(l, model)
+                    if forced is None:
+                        return None
+                    f.clauses += [self.ops.unit_clause(-x) for x in forced]
+                continue
+
+            # purification: if f contains a literal with single polarity, set it up to provoke unit propagations
+            # (literals of native constraints are not pure, as asserting them might violate the constraint)
+            l = self.ops.find_single_polarity(f.clauses, self.at_most_occurrences) if self.purify else None
+            if l is not None:
+                # adds a unit clause with l to f to trigger unit propagation
+                f.clauses.append(self.ops.unit_clause(l))
+                self.statistics['purifications'] += 1
+                continue
+            break
 
         # no unit propagations or pure literals, must choose a literal to branch on
         l = self.choose_literal(f, model)
+        return self.__branch(f, model, l)
 
-        # tries to branch on asserted then on negated literal
-        f.clauses.append([l])
-        result = self.__dpll(f, model)
+    def __falsify_constrained_literals(self, f, model):
+        """
+        Completes the model of an empty formula by setting the free literals of the native constraints to false.
+        Doing so cannot violate a constraint unless the negated literal is constrained as well,
+        so only such literals are branched on (the assignment might fail), the others are set directly
+        :param f: empty boolean formula
+        :param model: partial assignment (dict), modified in place
+        :return:
+        """
+        for x in self.at_most_occurrences:
+            if abs(x) not in model and -x not in self.at_most_occurrences:
+                model[abs(x)] = -x
+        l = self.__free_constrained_literal(model)
+        if l is None:
+            return model
+        return self.__branch(f, model, -l)
+
+    def __branch(self, f, model, l):
+        """
+        Branches on the asserted and then on the negated literal
+        :param f: boolean formula (instance of pysat.formula.CNF), modified in place
+        :param model: partial assignment (dict)
+        :param l: literal to branch on
+        :return:
+        """
+        if self.interrupted or (self.deadline is not None and time.monotonic() > self.deadline) or \
+                self.__stop_requested():
+            raise SearchInterrupted()
+        self.statistics['branches'] += 1
+
+        f.clauses.append(self.ops.unit_clause(l))
+        result = self.__search_branch(f, model, l)
         if result is not None:
             return result
         else:
             # undoes last append and insert negated literal
             del f.clauses[-1]
-            f.clauses.append([-l])
-            return self.__dpll(f, model)
+            f.clauses.append(self.ops.unit_clause(-l))
+            return self.__search_branch(f, model, -l)
+
+    def __stop_requested(self):
+        """
+        Returns whether the stop event is set, polling it every STOP_EVENT_POLL_INTERVAL branches
+        :return:
+        """
+        if self.stop_event is None or self.statistics['branches'] % STOP_EVENT_POLL_INTERVAL != 0:
+            return False
+        return self.stop_event.is_set()
+
+    def __search_branch(self, f, model, l):
+        """
+        Searches the branch where the decision l has been added to f.
+        If the branch fails and a proof is being written, the negation of
+        the decisions of the branch is written as a lemma
+        :param f: boolean formula, with the unit clause of l
+        :param model: partial assignment (dict)
+        :param l: literal branched on
+        :return:
+        """
+        self.decisions.append(l)
+        result = self.__dpll(f, model)
+        if result is None and self.proof_writer is not None:
+            self.__write_lemma([-d for d in self.decisions])
+        self.decisions.pop()
+        return result
+
+    def __write_lemma(self, lemma):
+        """
+        Writes a lemma to the proof. Lemmas are written as the search tree is
+        traversed in post-order, so lemmas longer than the new one written earlier
+        come from the subtree it refutes and are no longer needed: they are deleted
+        :param lemma: clause with the negation of the decisions of a failed branch
+        :return:
+        """
+        self.proof_writer.add(lemma)
+        while self.lemmas and len(self.lemmas[-1]) > len(lemma):
+            self.proof_writer.delete(self.lemmas.pop())
+        self.lemmas.append(lemma)
+
+    def __propagate_at_most(self, l, model):
+        """
+        Checks the native constraints where the (just asserted) literal l occurs
+        :param l: literal that has been added to the model
+        :param model: partial assignment (dict), including l
+        :return: list of free literals that must be set to false, or None if a constraint is violated
+        """
+        forced = []
+        for i in self.at_most_occurrences[l]:
+            lits, k = self.at_most[i]
+            n_true = len([x for x in lits if model.get(abs(x)) == x])
+            if n_true > k:
+                return None
+            if n_true == k:
+                forced += [x for x in lits if abs(x) not in model]
+        return forced
+
+    def __free_constrained_literal(self, model):
+        """
+        Returns a literal of a native constraint whose variable is not in the model,
+        or None if all of them are assigned
+        :param model: partial assignment (dict)
+        :return:
+        """
+        for x in self.at_most_occurrences:
+            if abs(x) not in model:
+                return x
+        return None
+
+
+def clause_operations(backend):
+    """
+    Returns the module with the clause-handling functions
+    (find_unit_clause, unit_propagation, etc.) of a formula representation
+    :param backend: 'cnf' for pysat.formula.CNF (functions in this module) or 'bitset' for dpll.bitset.BitsetFormula
+    :return:
+    """
+    if backend == 'cnf':
+        return sys.modules[__name__]
+    if backend == 'bitset':
+        from dpll import bitset
+        return bitset
+    raise ValueError(f"Unknown backend {backend}, please choose 'cnf' or 'bitset'")
+
+
+def load_formula(backend, cnf_file=None, formula=None):
+    """
+    Returns the formula in the representation of the backend, reading it from cnf_file if formula is None.
+    pysat is only imported when a file is read for the 'cnf' backend
+    :param backend: 'cnf' or 'bitset' (see clause_operations)
+    :param cnf_file: path to a .cnf file
+    :param formula: pysat.formula.CNF or dpll.bitset.BitsetFormula instance
+    :return:
+    """
+    ops = clause_operations(backend)
+    if formula is None:
+        if backend == 'bitset':
+            nv, clauses = read_dimacs(cnf_file)
+            return ops.BitsetFormula.from_clauses(clauses, nv)
+        from pysat.formula import CNF
+        return CNF(from_file=cnf_file)
+    if backend == 'bitset' and not isinstance(formula, ops.BitsetFormula):
+        return ops.BitsetFormula.from_cnf(formula)
+    return formula
+
+
+def read_dimacs(cnf_file):
+    """
+    Reads a .cnf file in DIMACS format. Clauses might span several lines
+    and reading stops at a '%' line (as in the SATLIB instances)
+    :param cnf_file: path to the file
+    :return: tuple(number of variables, list of clauses)
+    """
+    nv = 0
+    clauses = []
+    clause = []
+    with open(cnf_file) as cnf:
+        for line in cnf:
+            if line.startswith('c'):
+                continue
+            if line.startswith('p'):
+                nv = int(line.split()[2])
+                continue
+            if line.startswith('%'):
+                break
+            for token in line.split():
+                l = int(token)
+                if l == 0:
+                    clauses.append(clause)
+                    clause = []
+                else:
+                    clause.append(l)
+                    nv = max(nv, abs(l))
+    if clause:
+        clauses.append(clause)
+    return nv, clauses
 
 
 def check_model(clauses, model):
@@ -197,11 +442,12 @@ def unit_propagation(f, l):
     return new_f
 
 
-def find_single_polarity(clauses):
+def find_single_polarity(clauses, excluded=()):
     """
     Returns one literal that occurs with a single polarity
     in the formula, or None if none is found
     :param clauses:
+    :param excluded: container of literals that must not be returned
     :return:
     """
     # construct a set with all literals
@@ -211,11 +457,40 @@ def find_single_polarity(clauses):
 
     # returns the first literal whose negated is not present (i.e. a pure literal)
     for lit in literals:
-        if -lit not in literals:
+        if -lit not in literals and lit not in excluded:
             return lit
     return None
 
 
+def unit_clause(l):
+    """
+    Returns the unit clause with literal l
+    :param l:
+    :return:
+    """
+    return [l]
+
+
+def count_removed_literals(clauses, l):
+    """
+    Returns how many occurrences of ~l the unit propagation of l removes,
+    i.e., the number of clauses with ~l that do not contain l
+    :param clauses:
+    :param l:
+    :return:
+    """
+    return len([c for c in clauses if -l in c and l not in c])
+
+
+def has_empty_clause(clauses):
+    """
+    Returns whether any of the clauses is empty
+    :param clauses:
+    :return:
+    """
+    return any([len(c) == 0 for c in clauses])
+
+
 def find_unit_clause(clauses):
     """
     Returns the literal of the first unit clause found
@@ -241,4 +516,5 @@ def main(cnf_file):
 
 
 if __name__ == '__main__':
+    import fire
     fire.Fire(main)
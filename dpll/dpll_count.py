@@ -1,24 +1,24 @@
 from copy import copy
 
-import fire
-from pysat.formula import CNF
-
 from dpll import dpll
 
 
 class DPLLCount:
-    def __init__(self, cnf_file=None, formula=None, choice_function=None):
+    def __init__(self, cnf_file=None, formula=None, choice_function=None, backend='cnf'):
         """
         Creates a DPLL search instance. Either the cnf_file or the formula must be supplied
         :param cnf_file: path to a .cnf file
-        :param formula: pysat.formula.CNF instance
+        :param formula: pysat.formula.CNF instance (or dpll.bitset.BitsetFormula with the bitset backend)
         :param choice_function: function that receives a formula (pysat.formula.CNF) and a model (dict(var->assignment in DIMACS notation)) and chooses the next literal to branch on
+        :param backend: formula representation used during the search, 'cnf' or 'bitset' (see dpll.DPLL)
         """
         if cnf_file is None and formula is None:
             raise ValueError('Please provide either a cnf file or a formula')
         self.choose_literal = choice_function if choice_function is not None else dpll.choose_random_literal
 
-        self.formula = formula if formula is not None else CNF(from_file=cnf_file)
+        # functions that handle the clauses in the chosen representation
+        self.ops = dpll.clause_operations(backend)
+        self.formula = dpll.load_formula(backend, cnf_file, formula)
         self.n_vars = self.formula.nv
 
         self.statistics = {
@@ -55,7 +55,7 @@ class DPLLCount:
             return 2**len([free for free in range(1, self.n_vars+1) if free not in model])
 
         # if any clause is empty, the formula is UNSAT (0 solutions)
-        if any([len(c) == 0 for c in f.clauses]):
+        if self.ops.has_empty_clause(f.clauses):
             return 0
 
         # trying to use 'local' variables
@@ -64,21 +64,21 @@ class DPLLCount:
         # print(partial_model_dict_to_list(f.nv, model))
 
         # unit propagation if f contains a unit clause
-        l = dpll.find_unit_clause(f.clauses)
+        l = self.ops.find_unit_clause(f.clauses)
         if l is not None:
             model[abs(l)] = l  # adds the literal to its index in the model
-            f = dpll.unit_propagation(f, l)
+            f = self.ops.unit_propagation(f, l)
             return self.__dpll_count(f, model)
 
         # no unit propagations, must choose a literal to branch on
         l = self.choose_literal(f, model)
 
         # branches on asserted literal, collecting the number of models
-        f.clauses.append([l])
+        f.clauses.append(self.ops.unit_clause(l))
         count = self.__dpll_count(f, model)
         # undoes last append and branches on negated literal
         del f.clauses[-1]
-        f.clauses.append([-l])
+        f.clauses.append(self.ops.unit_clause(-l))
         return count + self.__dpll_count(f, model)
 
 
@@ -94,4 +94,5 @@ def main(cnf_file):
 
 
 if __name__ == '__main__':
+    import fire
     fire.Fire(main)
@@ -0,0 +1,167 @@
+"""
+Lookahead branching heuristic, in the style of the march and kcnfs solvers
+"""
+from dpll import bitset
+from dpll import dpll
+
+
+class Lookahead:
+    def __init__(self, max_candidates=10, double_lookahead=False, double_candidates=2):
+        """
+        Creates a choice function (see DPLL) that tentatively propagates both polarities
+        of a few preselected variables and branches on the one that reduces the formula the most.
+        Literals whose propagation leads to a conflict (failed literals) are branched on negated first,
+        and are remembered for the following nodes below the current one
+        (a call with an empty model starts a new search and forgets them, so an instance can be reused across formulas).
+        :param max_candidates: number of variables preselected for lookahead at each node
+        :param double_lookahead: whether the literals that reduce the formula the most are checked for failure at depth 2
+        :param double_candidates: number of literals that get a double lookahead at each node
+        """
+        self.max_candidates = max_candidates
+        self.double_lookahead = double_lookahead
+        self.double_candidates = double_candidates
+
+        # failed literals found at a node, which remain failed at its descendants
+        self.cached_model = {}
+        self.cached_failed = []
+
+        self.statistics = {
+            'lookaheads': 0,
+            'double_lookaheads': 0,
+            'failed_literals': 0,
+            'cache_hits': 0,
+        }
+
+    def __call__(self, f, model):
+        """
+        Chooses the literal to branch on
+        :param f: pysat.formula.CNF or dpll.bitset.BitsetFormula instance
+        :param model: partial assignment (dict)
+        :return:
+        """
+        clauses = f.to_clauses() if isinstance(f, bitset.BitsetFormula) else f.clauses
+        occurrences = {}
+        for i, c in enumerate(clauses):
+            for l in c:
+                occurrences.setdefault(l, []).append(i)
+
+        failed = self.__cached_failed_literal(model, occurrences)
+        if failed is not None:
+            self.statistics['cache_hits'] += 1
+            return -failed
+
+        candidates = preselect(clauses, occurrences, self.max_candidates)
+        if not candidates:
+            return dpll.choose_random_literal(f, model)
+
+        # single lookahead on both polarities of each candidate
+        diffs = {}
+        failed = []
+        for v in candidates:
+            for l in (v, -v):
+                self.statistics['lookaheads'] += 1
+                diff = lookahead(clauses, occurrences, [l])
+                if diff is None:
+                    failed.append(l)
+                else:
+                    diffs[l] = diff
+
+        # double lookahead: l fails if, for some other candidate w, propagating l with w and with -w both fail
+        if self.double_lookahead:
+            for l in sorted(diffs, key=diffs.get, reverse=True)[:self.double_candidates]:
+                for w in candidates:
+                    if w == abs(l) or w in failed or -w in failed:
+                        continue
+                    self.statistics['double_lookaheads'] += 1
+                    if lookahead(clauses, occurrences, [l, w]) is None and lookahead(clauses, occurrences, [l, -w]) is None:
+                        failed.append(l)
+                        del diffs[l]
+                        break
+
+        if failed:
+            self.statistics['failed_literals'] += len(failed)
+            self.cached_model = dict(model)
+            self.cached_failed = failed[1:]
+            return -failed[0]
+
+        # the product favors variables that reduce the formula on both branches
+        def score(v):
+            return 1024 * diffs[v] * diffs[-v] + diffs[v] + diffs[-v]
+
+        v = max(candidates, key=score)
+        # the branch that reduces the formula less is more likely to be satisfiable, so it goes first
+        return v if diffs[v] <= diffs[-v] else -v
+
+    def __cached_failed_literal(self, model, occurrences):
+        """
+        Returns a failed literal found at an ancestor of the current node whose variable
+        is still in the formula, or None
+        :param model: partial assignment (dict) of the current node
+        :param occurrences: dict(literal -> indices of the clauses where it occurs) of the current formula
+        :return:
+        """
+        if not self.cached_failed:
+            return None
+        if not model or any([model.get(v) != l for v, l in self.cached_model.items()]):
+            # a new search, or not below the node where the literals failed
+            self.cached_failed = []
+            return None
+        while self.cached_failed:
+            l = self.cached_failed.pop()
+            if abs(l) not in model and (l in occurrences or -l in occurrences):
+                return l
+        return None
+
+
+def preselect(clauses, occurrences, max_candidates):
+    """
+    Returns the variables with the highest weighted occurrences in both polarities.
+    Occurrences in shorter clauses weigh more, as assigning them is more likely to produce propagations
+    :param clauses: list of clauses (lists of literals)
+    :param occurrences: dict(literal -> indices of the clauses where it occurs)
+    :param max_candidates: maximum number of variables returned
+    :return:
+    """
+    def weight(l):
+        return sum([5.0 ** (2 - len(clauses[i])) for i in occurrences.get(l, ())])
+
+    variables = {abs(l) for l in occurrences}
+    ranking = sorted(variables, key=lambda v: weight(v) * weight(-v) + weight(v) + weight(-v), reverse=True)
+    return ranking[:max_candidates]
+
+
+def lookahead(clauses, occurrences, literals):
+    """
+    Propagates the literals and measures how much the formula is reduced:
+    each clause shortened but not satisfied counts 5^(2-length), so every new binary clause counts 1
+    :param clauses: list of clauses (lists of literals)
+    :param occurrences: dict(literal -> indices of the clauses where it occurs)
+    :param literals: literals to propagate
+    :return: the reduction, or None if propagation leads to a conflict
+    """
+    assigned = set()
+    queue = list(literals)
+    shortened = set()
+    while queue:
+        l = queue.pop()
+        if l in assigned:
+            continue
+        if -l in assigned:
+            return None
+        assigned.add(l)
+        for i in occurrences.get(-l, ()):
+            free = [x for x in clauses[i] if -x not in assigned]
+            if any([x in assigned for x in free]):
+                continue
+            if len(free) == 0:
+                return None
+            if len(free) == 1:
+                queue.append(free[0])
+            shortened.add(i)
+
+    reduction = 0.0
+    for i in shortened:
+        free = [x for x in clauses[i] if -x not in assigned]
+        if len(free) > 1 and not any([x in assigned for x in free]):
+            reduction += 5.0 ** (2 - len(free))
+    return reduction
@@ -0,0 +1,94 @@
+"""
+DRAT proof output, checkable with e.g. drat-trim (https://github.com/marijnheule/drat-trim)
+"""
+
+
+class DRATWriter:
+    def __init__(self, sink, binary=False, buffer_size=65536):
+        """
+        Creates a proof writer that streams lemmas and deletions to a sink.
+        Output is accumulated in memory and written in chunks of buffer_size bytes
+        :param sink: path of the proof file or a file object opened in binary mode
+        :param binary: whether to use the binary DRAT format instead of the textual one
+        :param buffer_size: number of bytes to accumulate before writing to the sink
+        """
+        self.binary = binary
+        self.buffer_size = buffer_size
+        self.buffer = bytearray()
+        self.owns_file = isinstance(sink, str)
+        self.file = open(sink, 'wb') if self.owns_file else sink
+        self.lemmas = 0
+        self.deletions = 0
+
+    def add(self, clause):
+        """
+        Writes the addition of a lemma
+        :param clause: list of literals in DIMACS notation (empty for the final empty clause)
+        :return:
+        """
+        self.lemmas += 1
+        self.__write(b'a', b'', clause)
+
+    def delete(self, clause):
+        """
+        Writes the deletion of a clause
+        :param clause: list of literals in DIMACS notation
+        :return:
+        """
+        self.deletions += 1
+        self.__write(b'd', b'd ', clause)
+
+    def flush(self):
+        """
+        Writes the buffered output to the sink
+        :return:
+        """
+        self.file.write(self.buffer)
+        self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        """
+        Flushes the buffered output and closes the sink if it was opened by this writer
+        :return:
+        """
+        self.flush()
+        if self.owns_file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __write(self, binary_prefix, text_prefix, clause):
+        if self.binary:
+            self.buffer += binary_prefix
+            for l in clause:
+                self.buffer += encode_binary_literal(l)
+            self.buffer.append(0)
+        else:
+            self.buffer += text_prefix
+            self.buffer += ' '.join([str(l) for l in clause + [0]]).encode()
+            self.buffer.append(ord('\n'))
+
+        if len(self.buffer) >= self.buffer_size:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+
+
+def encode_binary_literal(l):
+    """
+    Encodes a literal as in the binary DRAT format: 2*var + sign,
+    written in little-endian groups of 7 bits, with the high bit set on all bytes but the last
+    :param l: literal in DIMACS notation
+    :return: bytes
+    """
+    u = 2 * abs(l) + (l < 0)
+    encoded = bytearray()
+    while u > 127:
+        encoded.append(u & 127 | 128)
+        u >>= 7
+    encoded.append(u)
+    return bytes(encoded)
@@ -0,0 +1,109 @@
+import asyncio
+import time
+import unittest
+
+import pysat.formula
+
+from dpll import dpll
+from dpll.async_solver import AsyncDPLL
+
+
+class TestAsyncDPLL(unittest.TestCase):
+    def test_solve(self):
+        async def run():
+            async with AsyncDPLL(max_concurrency=2) as pool:
+                return await asyncio.gather(
+                    pool.solve(cnf_file='instances/uf50-01.cnf', backend='bitset'),
+                    pool.solve(cnf_file='instances/uuf50-01.cnf', backend='bitset'),
+                )
+
+        (sat_model, sat_stats), (unsat_model, unsat_stats) = asyncio.run(run())
+        f = pysat.formula.CNF(from_file='instances/uf50-01.cnf')
+        self.assertTrue(dpll.check_model(f.clauses, dpll.model_dict_to_list(f.nv, sat_model)))
+        self.assertIsNone(unsat_model)
+        self.assertGreater(unsat_stats['branches'], 0)
+
+    def test_timeout_and_progress(self):
+        reports = []
+
+        async def run():
+            async with AsyncDPLL(progress_interval=0.01) as pool:
+                await pool.solve(cnf_file='instances/uuf50-01.cnf', timeout=0.2, progress=reports.append)
+
+        self.assertRaises(asyncio.TimeoutError, asyncio.run, run())
+        self.assertGreater(len(reports), 0)
+        self.assertIn('branches', reports[-1])
+
+    def test_cancel_does_not_block_loop(self):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0.01)
+
+        async def run():
+            async with AsyncDPLL(max_concurrency=1) as pool:
+                tick_task = asyncio.create_task(ticker())
+                first = asyncio.create_task(pool.solve(cnf_file='instances/uuf50-01.cnf'))
+                second = asyncio.create_task(pool.solve(cnf_file='instances/uf50-01.cnf', backend='bitset'))
+                await asyncio.sleep(0.2)
+                self.assertEqual(1, pool.running)
+                self.assertEqual(1, pool.queued)
+                first.cancel()
+                model, _ = await second
+                tick_task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await first
+                return model
+
+        self.assertIsNotNone(asyncio.run(run()))
+        self.assertGreater(len(ticks), 5)
+
+    def test_processes(self):
+        async def run():
+            async with AsyncDPLL(max_concurrency=2, use_processes=True) as pool:
+                f = pysat.formula.CNF(from_clauses=[[1, -2], [1, 3], [-3, -2]])
+                return await pool.solve(formula=f)
+
+        model, statistics = asyncio.run(run())
+        self.assertEqual({1: 1, 3: -3}, model)
+
+    def test_processes_timeout_and_progress(self):
+        reports = []
+
+        async def run():
+            async with AsyncDPLL(use_processes=True, progress_interval=0.05) as pool:
+                await pool.solve(cnf_file='instances/uuf50-01.cnf', timeout=0.5, progress=reports.append)
+
+        self.assertRaises(asyncio.TimeoutError, asyncio.run, run())
+        self.assertGreater(len(reports), 0)
+        self.assertGreater(reports[-1]['branches'], 0)
+
+    def test_processes_cancel(self):
+        """
+        Cancelling a search in a worker process stops it, and its slot is
+        only released once it stopped, so the next request gets a free worker
+        """
+        async def run():
+            async with AsyncDPLL(max_concurrency=1, use_processes=True) as pool:
+                first = asyncio.create_task(pool.solve(cnf_file='instances/uuf50-01.cnf'))
+                await asyncio.sleep(0.5)
+                self.assertEqual(1, pool.running)
+                first.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await first
+                self.assertEqual(0, pool.running)
+
+                start = time.monotonic()
+                f = pysat.formula.CNF(from_clauses=[[1, -2], [1, 3], [-3, -2]])
+                model, _ = await pool.solve(formula=f)
+                return model, time.monotonic() - start
+
+        model, elapsed = asyncio.run(run())
+        self.assertEqual({1: 1, 3: -3}, model)
+        self.assertLess(elapsed, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import shutil
+import unittest
+import tarfile
+
+import pysat.formula
+
+from dpll import bitset
+from dpll import dpll
+from dpll.dpll_count import DPLLCount
+
+
+class TestBitset(unittest.TestCase):
+    def test_encode_decode_clause(self):
+        self.assertEqual((0b1010, 0b0100), bitset.encode_clause([1, -2, 3]))
+        self.assertEqual([1, -2, 3], bitset.decode_clause((0b1010, 0b0100)))
+        self.assertEqual([], bitset.decode_clause((0, 0)))
+
+    def test_from_clauses(self):
+        f = bitset.BitsetFormula.from_clauses([[1, -2], [2, -1, 1], [-3]])
+        self.assertEqual(3, f.nv)
+        self.assertEqual([[1, -2], [-3]], f.to_clauses())  # tautology discarded
+
+    def test_find_single_polarity(self):
+        clauses = bitset.BitsetFormula.from_clauses
+        self.assertEqual(1, bitset.find_single_polarity(clauses([[1, -2], [2]]).clauses))
+        self.assertEqual(-2, bitset.find_single_polarity(clauses([[1, -2], [-1]]).clauses))
+        self.assertEqual(-2, bitset.find_single_polarity(clauses([[1, -2], [1]]).clauses, {1}))
+        self.assertEqual(None, bitset.find_single_polarity(clauses([[1, -2], [-1, 2]]).clauses))
+
+    def test_find_unit_clause(self):
+        clauses = bitset.BitsetFormula.from_clauses
+        self.assertEqual(2, bitset.find_unit_clause(clauses([[1, -2], [2]]).clauses))
+        self.assertEqual(-1, bitset.find_unit_clause(clauses([[1, -2], [-1]]).clauses))
+        self.assertEqual(None, bitset.find_unit_clause(clauses([[1, -2], [-1, 2]]).clauses))
+
+    def test_unit_propagation_until_empty(self):
+        f = bitset.BitsetFormula.from_clauses([[-1, -2], [2], [2, -3, -4]])
+        f = bitset.unit_propagation(f, 2)
+        self.assertEqual([[-1]], f.to_clauses())
+        self.assertFalse(bitset.has_empty_clause(f.clauses))
+
+        g = bitset.unit_propagation(f, 1)
+        self.assertTrue(bitset.has_empty_clause(g.clauses))
+
+        f = bitset.unit_propagation(f, -1)
+        self.assertEqual([], f.clauses)
+
+    def test_dpll_solve_bitset(self):
+        f = pysat.formula.CNF(from_clauses=[[1, -2], [1, 3], [-3, -2]])
+        solver = dpll.DPLL(formula=f, backend='bitset')
+        self.assertEqual([1, -2, 3], solver.get_model_list())  # pure literals are taken by increasing variable
+
+        f = pysat.formula.CNF(from_clauses=[[1], [-1]])
+        self.assertIsNone(dpll.DPLL(formula=f, backend='bitset').solve())
+
+    def test_dpll_invalid_backend(self):
+        f = pysat.formula.CNF(from_clauses=[[1]])
+        self.assertRaises(ValueError, dpll.DPLL, formula=f, backend='bdd')
+
+    def test_dpll_satlib_bitset(self):
+        f = pysat.formula.CNF(from_file='instances/uf50-01.cnf')
+        model = dpll.DPLL(formula=f, backend='bitset').get_model_list()
+        self.assertTrue(dpll.check_model(f.clauses, model))
+        self.assertEqual([], dpll.DPLL(cnf_file='instances/uuf50-01.cnf', backend='bitset').get_model_list())
+
+    def test_count_bitset(self):
+        """
+        Compares the model counts of both backends on 100 SATisfiable random 3CNF instances with 20 vars
+        """
+        tmp_dir = '/tmp/sat100_bitset'
+        with tarfile.open('instances/3cnf_v20_sat.tar.gz') as tf:
+            tf.extractall(tmp_dir)
+        for f in os.listdir(tmp_dir):
+            path = os.path.join(tmp_dir, f)
+            self.assertEqual(DPLLCount(cnf_file=path).count(), DPLLCount(cnf_file=path, backend='bitset').count())
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
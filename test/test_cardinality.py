@@ -0,0 +1,116 @@
+import itertools
+import unittest
+
+import pysat.formula
+from pysat.solvers import Solver
+
+from dpll import dpll
+from dpll import cardinality
+
+
+class TestCardinality(unittest.TestCase):
+    def assert_at_most_k(self, literals, k, clauses):
+        """
+        Checks that clauses accept exactly the assignments of literals with at most k true ones
+        """
+        with Solver(bootstrap_with=clauses) as s:
+            for signs in itertools.product([1, -1], repeat=len(literals)):
+                assumptions = [sign * x for sign, x in zip(signs, literals)]
+                n_true = len([sign for sign in signs if sign > 0])
+                self.assertEqual(n_true <= k, s.solve(assumptions=assumptions), assumptions)
+
+    def test_at_most_one_pairwise(self):
+        self.assertEqual([[-1, -2], [-1, 3], [-2, 3]], cardinality.at_most_one_pairwise([1, 2, -3]))
+        self.assert_at_most_k([1, 2, 3, 4], 1, cardinality.at_most_one_pairwise([1, 2, 3, 4]))
+
+    def test_at_most_one_commander(self):
+        for n in range(1, 12):
+            literals = list(range(1, n+1))
+            clauses, top = cardinality.at_most_one_commander(literals, n)
+            self.assertGreaterEqual(top, n)
+            self.assert_at_most_k(literals, 1, clauses)
+
+    def test_at_most_k_sequential(self):
+        for n in range(1, 8):
+            for k in range(0, n+1):
+                literals = list(range(1, n+1))
+                clauses, top = cardinality.at_most_k_sequential(literals, k, n)
+                self.assert_at_most_k(literals, k, clauses)
+
+    def test_at_most_k_totalizer(self):
+        for n in range(1, 8):
+            for k in range(0, n+1):
+                literals = list(range(1, n+1))
+                clauses, top = cardinality.at_most_k_totalizer(literals, k, n)
+                self.assert_at_most_k(literals, k, clauses)
+
+    def test_negated_literals(self):
+        literals = [1, -2, 3, -4, 5]
+        for encoding in cardinality.ENCODINGS:
+            clauses, top = cardinality.at_most_k(literals, 1, 5, encoding)
+            self.assert_at_most_k(literals, 1, clauses)
+
+    def test_exactly_one(self):
+        clauses, top = cardinality.exactly_one([1, 2, 3, 4, 5], 5)
+        with Solver(bootstrap_with=clauses) as s:
+            models = [[x for x in m if 0 < x <= 5] for m in s.enum_models()]
+        self.assertEqual([[1], [2], [3], [4], [5]], sorted(models))
+
+    def test_at_most_k_invalid(self):
+        self.assertRaises(ValueError, cardinality.at_most_k, [1, 2, 3], 2, 3, 'pairwise')
+        self.assertRaises(ValueError, cardinality.at_most_k, [1, 2, 3], 1, 3, 'binomial')
+
+    def test_dpll_native_at_most_one(self):
+        # at least one of 1, 2, 3 and at most one of them, then 3 is excluded
+        f = pysat.formula.CNF(from_clauses=[[1, 2, 3], [-3]])
+        model = dpll.DPLL(formula=f, at_most=[([1, 2, 3], 1)]).solve()
+        self.assertIsNotNone(model)
+        self.assertEqual(1, len([v for v in [1, 2, 3] if model[v] > 0]))
+        self.assertEqual(-3, model[3])
+
+    def test_dpll_native_at_most_k_unsat(self):
+        # 3 out of 4 variables are asserted, but at most 2 can be true
+        f = pysat.formula.CNF(from_clauses=[[1], [2, 3], [3, 4], [2, 4]])
+        self.assertIsNone(dpll.DPLL(formula=f, at_most=[([1, 2, 3, 4], 2)]).solve())
+
+    def test_dpll_native_constraint_only_variables(self):
+        # variable 4 occurs only in the constraint and must be in the model, set to false
+        f = pysat.formula.CNF(from_clauses=[[1, 2]])
+        solver = dpll.DPLL(formula=f, at_most=[([1, 2, 4], 1)])
+        model = solver.get_model_list()
+        self.assertEqual(4, len(model))
+        self.assertEqual(1, len([x for x in model if x in [1, 2, 4]]))
+        self.assertEqual(-4, model[3])
+
+    def test_dpll_native_long_chains(self):
+        # setting the first half of 300 constrained variables forces the other half, one literal after the other
+        clauses = [[x] for x in range(1, 151)]
+        for backend in ['cnf', 'bitset']:
+            f = pysat.formula.CNF(from_clauses=clauses)
+            model = dpll.DPLL(formula=f, at_most=[(range(1, 301), 150)], backend=backend).get_model_list()
+            self.assertEqual(list(range(1, 151)) + list(range(-151, -301, -1)), model)
+
+            # variables that occur only in the constraint are set to false without branching
+            solver = dpll.DPLL(formula=pysat.formula.CNF(from_clauses=[[1]]), at_most=[(range(1, 301), 150)], backend=backend)
+            self.assertEqual([1] + list(range(-2, -301, -1)), solver.get_model_list())
+            self.assertEqual(0, solver.statistics['branches'])
+
+    def test_dpll_native_counts(self):
+        """
+        Checks native constraints against their clausal encoding on all
+        combinations of at most k out of 6 variables plus some clauses
+        """
+        clauses = [[1, 2, -3], [-1, 4], [3, 5, 6], [-2, -6]]
+        literals = [1, 2, 3, 4, 5, 6]
+        for k in range(0, 4):
+            model = dpll.DPLL(formula=pysat.formula.CNF(from_clauses=clauses), at_most=[(literals, k)]).get_model_list()
+            encoded, top = cardinality.at_most_k(literals, k, 6)
+            with Solver(bootstrap_with=clauses + encoded) as s:
+                self.assertEqual(s.solve(), len(model) > 0)
+            if len(model) > 0:
+                self.assertTrue(dpll.check_model(clauses, model))
+                self.assertLessEqual(len([x for x in model if x > 0]), k)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,7 @@ import os
 import unittest
 import tarfile
 
-import pysat
+import pysat.formula
 
 from dpll import dpll
 
@@ -40,6 +40,13 @@ class TestDPLL(unittest.TestCase):
         self.assertEqual([-1, 2, 3, -4, 5], dpll.model_dict_to_list(5, {1: -1, 4: -4}))
         self.assertEqual([], dpll.model_dict_to_list(5, None))
 
+    def test_read_dimacs(self):
+        for path in ['instances/uf50-01.cnf', 'instances/uuf50-01.cnf', 'instances/uf75-044_clean.cnf']:
+            f = pysat.formula.CNF(from_file=path)
+            nv, clauses = dpll.read_dimacs(path)
+            self.assertEqual(f.nv, nv)
+            self.assertEqual(f.clauses, clauses)
+
     def test_find_single_polarity(self):
         self.assertEqual(1, dpll.find_single_polarity([[1, -2], [2]]))
         self.assertEqual(1, dpll.find_single_polarity([[1, -2], [1]]))
@@ -112,6 +119,38 @@ class TestDPLL(unittest.TestCase):
         self.assertEqual({1: 1, 3: -3}, model)
         self.assertEqual('1 2 -3', solver.get_model_str())
 
+    def test_statistics(self):
+        # 2 is propagated first, removing two clauses and the -2 of [1, -2, 3]; then 1 is pure and satisfies the rest
+        clauses = [[2], [2, 3], [1, -2, 3], [1, -3]]
+        for backend in ['cnf', 'bitset']:
+            solver = dpll.DPLL(formula=pysat.formula.CNF(from_clauses=clauses), backend=backend)
+            self.assertIsNotNone(solver.solve())
+            self.assertEqual(0, solver.statistics['branches'])
+            self.assertEqual(1, solver.statistics['purifications'])
+            self.assertEqual(2, solver.statistics['unit_propagations'])
+            self.assertEqual(5, solver.statistics['up_clauses_cleaned'])  # including the unit clause of 1
+            self.assertEqual(1, solver.statistics['up_literals_cleaned'])
+
+    def test_stop_event(self):
+        class CountingEvent:
+            def __init__(self, set_after):
+                self.calls = 0
+                self.set_after = set_after
+
+            def is_set(self):
+                self.calls += 1
+                return self.calls > self.set_after
+
+        # the event is polled every STOP_EVENT_POLL_INTERVAL branches
+        event = CountingEvent(set_after=10**9)
+        solver = dpll.DPLL(cnf_file='instances/uuf50-01.cnf', backend='bitset', stop_event=event)
+        self.assertIsNone(solver.solve())
+        self.assertEqual((solver.statistics['branches'] - 1) // dpll.STOP_EVENT_POLL_INTERVAL + 1, event.calls)
+
+        event = CountingEvent(set_after=2)
+        solver = dpll.DPLL(cnf_file='instances/uuf50-01.cnf', backend='bitset', stop_event=event)
+        self.assertRaises(dpll.SearchInterrupted, solver.solve)
+        self.assertEqual(2 * dpll.STOP_EVENT_POLL_INTERVAL, solver.statistics['branches'])
 
 
 if __name__ == '__main__':
@@ -3,7 +3,7 @@ import shutil
 import unittest
 import tarfile
 
-import pysat
+import pysat.formula
 
 from dpll import dpll
 
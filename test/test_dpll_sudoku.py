@@ -1,6 +1,7 @@
+import random
 import unittest
 
-import pysat
+import pysat.formula
 
 from dpll import dpll
 
@@ -55,6 +56,26 @@ def region_rules (cnf):
     return cnf
 
 
+def rule_groups(m=M):
+    """
+    Returns the groups of variables where exactly one must be true
+    (cells, rows, columns and regions) in a Sudoku with regions of m x m cells
+    """
+    n = m * m
+
+    def var(i, j, k):
+        return i*n*n + j*n + k + 1
+
+    groups = [[var(i, j, k) for k in range(n)] for i in range(n) for j in range(n)]
+    groups += [[var(i, j, k) for i in range(n)] for j in range(n) for k in range(n)]
+    groups += [[var(i, j, k) for j in range(n)] for i in range(n) for k in range(n)]
+    groups += [
+        [var(y*m + i, x*m + j, k) for i in range(m) for j in range(m)]
+        for k in range(n) for x in range(m) for y in range(m)
+    ]
+    return groups
+
+
 class TestDPLLSudoku(unittest.TestCase):
     def test_sudoku(self):
         cnf = []
@@ -112,6 +133,50 @@ class TestDPLLSudoku(unittest.TestCase):
             if (i+1) % N == 0: print("")          # newline
             if (i+1) % (N*M) == 0: print("-" * 21)    # vertical wall
 
+    def test_sudoku_native_constraints(self):
+        """
+        Same puzzle as test_sudoku, with the at-most-one part of the rules
+        handled natively by the solver instead of pairwise clauses
+        """
+        example = [
+            (0, 0, 2), (0, 1, 5), (0, 4, 3), (0, 6, 9), (0, 8, 1),
+            (1, 1, 1), (1, 5, 4),
+            (2, 0, 4), (2, 2, 7), (2, 6, 2), (2, 8, 8),
+            (3, 2, 5), (3, 3, 2),
+            (4, 4, 9), (4, 5, 8), (4, 6, 1),
+            (5, 1, 4), (5, 5, 3),
+            (6, 3, 3), (6, 4, 6), (6, 7, 7), (6, 8, 2),
+            (7, 1, 7), (7, 8, 3),
+            (8, 0, 9), (8, 2, 3), (8, 6, 6), (8, 8, 4)
+        ]
+
+        groups = rule_groups()
+        cnf = groups + [[flatten_var(z[0], z[1], z[2]) - 1] for z in example]
+        f = pysat.formula.CNF(from_clauses=cnf)
+        solution = dpll.DPLL(formula=f, at_most=[(g, 1) for g in groups]).get_model_list()
+
+        self.assertNotEqual(0, len(solution))
+        self.assertTrue(dpll.check_model(cnf, solution))
+        for g in groups:
+            self.assertEqual(1, len([v for v in g if solution[v-1] > 0]))
+
+    def test_sudoku_16x16_native_constraints(self):
+        """
+        16x16 puzzle with 60% of the cells of a valid grid as clues, which leaves long
+        chains of literals forced by the native constraints
+        """
+        m, n = 4, 16
+        grid = [[(m * (i % m) + i // m + j) % n for j in range(n)] for i in range(n)]
+        cells = random.Random(0).sample([(i, j) for i in range(n) for j in range(n)], int(0.6 * n * n))
+        groups = rule_groups(m)
+        cnf = groups + [[i*n*n + j*n + grid[i][j] + 1] for i, j in cells]
+        f = pysat.formula.CNF(from_clauses=cnf)
+        solution = dpll.DPLL(formula=f, at_most=[(g, 1) for g in groups], backend='bitset').get_model_list()
+        self.assertEqual(n*n*n, len(solution))
+        self.assertTrue(dpll.check_model(cnf, solution))
+        for g in groups:
+            self.assertEqual(1, len([v for v in g if solution[v-1] > 0]))
+
 
 if __name__ == '__main__':
     unittest.main()
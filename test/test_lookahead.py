@@ -0,0 +1,96 @@
+import os
+import shutil
+import unittest
+import tarfile
+
+import pysat.formula
+
+from dpll import dpll
+from dpll import lookahead
+from dpll.dpll_count import DPLLCount
+
+
+def occurrences_of(clauses):
+    occurrences = {}
+    for i, c in enumerate(clauses):
+        for l in c:
+            occurrences.setdefault(l, []).append(i)
+    return occurrences
+
+
+class TestLookahead(unittest.TestCase):
+    def test_lookahead_reduction(self):
+        clauses = [[1, 2, 3], [1, -2, 4], [-1, 2, 3, 4], [-4, 5]]
+        occurrences = occurrences_of(clauses)
+        # -1 shortens the first two clauses to binaries
+        self.assertEqual(2.0, lookahead.lookahead(clauses, occurrences, [-1]))
+        # 1 shortens the third clause to a ternary
+        self.assertEqual(0.2, lookahead.lookahead(clauses, occurrences, [1]))
+        # -5 propagates -4, then [1, -2] and [-1, 2, 3] remain
+        self.assertAlmostEqual(1.2, lookahead.lookahead(clauses, occurrences, [-5]))
+
+    def test_lookahead_conflict(self):
+        clauses = [[1, 2], [1, -2], [3, 4]]
+        occurrences = occurrences_of(clauses)
+        self.assertIsNone(lookahead.lookahead(clauses, occurrences, [-1]))
+        self.assertIsNotNone(lookahead.lookahead(clauses, occurrences, [1]))
+        self.assertIsNone(lookahead.lookahead(clauses, occurrences, [3, -4, -1]))
+
+    def test_preselect(self):
+        clauses = [[1, 2], [-1, 3, 4], [-2, 3, 4], [2, -3, -4, 5]]
+        self.assertEqual([2, 1], lookahead.preselect(clauses, occurrences_of(clauses), 2))
+
+    def test_failed_literal(self):
+        # -1 fails, and so does -3 once we are below the node where 1 is asserted
+        clauses = [[1, 2], [1, -2], [3, 4, 5], [3, -4, 5], [3, 4, -5], [3, -4, -5], [-1, 3, 6]]
+        f = pysat.formula.CNF(from_clauses=clauses)
+        chooser = lookahead.Lookahead(max_candidates=6)
+        self.assertEqual(1, chooser(f, {}))
+        self.assertEqual(1, chooser.statistics['failed_literals'])
+
+        chooser = lookahead.Lookahead(max_candidates=6, double_lookahead=True)
+        self.assertEqual(1, chooser(f, {}))
+        self.assertEqual(2, chooser.statistics['failed_literals'])  # -3 fails at depth 2
+        self.assertEqual(3, chooser(f, {1: 1, 6: 6}))
+        self.assertEqual(1, chooser.statistics['cache_hits'])
+
+    def test_reused_chooser(self):
+        """
+        The failed literals of one formula must not be branched on when the chooser is reused on another
+        """
+        chooser = lookahead.Lookahead()
+        chooser(pysat.formula.CNF(from_clauses=[[1, 2], [1, -2], [3, 4], [3, -4], [5, 6, 7]]), {})
+        self.assertEqual(2, chooser.statistics['failed_literals'])
+        f = pysat.formula.CNF(from_clauses=[[1, 2]])
+        self.assertEqual(3, DPLLCount(formula=f, choice_function=chooser).count())
+        self.assertEqual(0, chooser.statistics['cache_hits'])
+
+    def test_dpll_lookahead_unsat20vars(self):
+        """
+        Tests the solver with lookahead on 100 UNSATisfiable random 3CNF instances with 20 vars
+        """
+        tmp_dir = '/tmp/unsat100_lookahead'
+        with tarfile.open('instances/3cnf_v20_unsat.tar.gz') as tf:
+            tf.extractall(tmp_dir)
+        for f in os.listdir(tmp_dir):
+            solver = dpll.DPLL(cnf_file=os.path.join(tmp_dir, f), choice_function=lookahead.Lookahead(), backend='bitset')
+            self.assertIsNone(solver.solve())
+        shutil.rmtree(tmp_dir)
+
+    def test_dpll_lookahead_satlib(self):
+        for path in ['instances/uf50-01.cnf', 'instances/uf75-044_clean.cnf']:
+            f = pysat.formula.CNF(from_file=path)
+            model = dpll.DPLL(formula=f, choice_function=lookahead.Lookahead(double_lookahead=True)).get_model_list()
+            self.assertTrue(dpll.check_model(f.clauses, model))
+
+    def test_count_lookahead(self):
+        f = pysat.formula.CNF(from_file='instances/uf50-01.cnf')
+        f.clauses = f.clauses[:150]
+        self.assertEqual(
+            DPLLCount(formula=f, backend='bitset').count(),
+            DPLLCount(formula=f, backend='bitset', choice_function=lookahead.Lookahead()).count()
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
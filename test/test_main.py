@@ -0,0 +1,59 @@
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from dpll import __main__ as cli
+
+
+class TestMain(unittest.TestCase):
+    def run_main(self, args, stdin=''):
+        out = io.StringIO()
+        old_stdin = sys.stdin
+        sys.stdin = io.StringIO(stdin)
+        try:
+            with redirect_stdout(out), redirect_stderr(io.StringIO()):
+                status = cli.main(args)
+        finally:
+            sys.stdin = old_stdin
+        return status, out.getvalue().splitlines()
+
+    def test_files(self):
+        status, lines = self.run_main(['instances/uf50-01.cnf', 'instances/uuf50-01.cnf'])
+        self.assertEqual(0, status)
+        self.assertEqual(2, len(lines))
+        path, result, model = lines[0].split('\t')
+        self.assertEqual(('instances/uf50-01.cnf', 'SAT', 50), (path, result, len(model.split())))
+        self.assertEqual('instances/uuf50-01.cnf\tUNSAT', lines[1])
+
+        status, lines = self.run_main(['--backend=cnf', 'instances/uf50-040_clean.cnf'])
+        self.assertEqual('SAT', lines[0].split('\t')[1])
+
+    def test_stdin(self):
+        status, lines = self.run_main(['-'], 'instances/uuf50-01.cnf\n\ninstances/uf50-040_clean.cnf\n')
+        self.assertEqual(0, status)
+        self.assertEqual(['UNSAT', 'SAT'], [line.split('\t')[1] for line in lines])
+
+    def test_errors(self):
+        bad_file = '/tmp/bad_literal.cnf'
+        with open(bad_file, 'w') as f:
+            f.write('p cnf 2 1\n1 x 0\n')
+        stdin = 'instances/missing.cnf\n' + bad_file + '\ninstances/uuf50-01.cnf\n'
+        for backend in ['bitset', 'cnf']:
+            status, lines = self.run_main([f'--backend={backend}', '-'], stdin)
+            self.assertEqual(0, status)
+            self.assertEqual(3, len(lines))
+            self.assertEqual(['instances/missing.cnf', 'ERROR'], lines[0].split('\t')[:2])
+            self.assertEqual([bad_file, 'ERROR'], lines[1].split('\t')[:2])
+            self.assertEqual('instances/uuf50-01.cnf\tUNSAT', lines[2])
+        os.remove(bad_file)
+
+    def test_usage(self):
+        self.assertEqual(2, self.run_main([])[0])
+        self.assertEqual(2, self.run_main(['--help'])[0])
+        self.assertEqual((2, []), self.run_main(['--backend=foo', 'instances/uf50-01.cnf']))
+
+
+if __name__ == '__main__':
+    unittest.main()
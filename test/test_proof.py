@@ -0,0 +1,146 @@
+import io
+import os
+import shutil
+import unittest
+import tarfile
+
+import pysat.formula
+
+from dpll import dpll
+from dpll import proof
+
+
+def parse_text_proof(text):
+    """
+    Returns the steps of a textual DRAT proof as a list of ('a' or 'd', clause)
+    """
+    steps = []
+    for line in text.decode().splitlines():
+        tokens = line.split()
+        if tokens[0] == 'd':
+            steps.append(('d', [int(t) for t in tokens[1:-1]]))
+        else:
+            steps.append(('a', [int(t) for t in tokens[:-1]]))
+    return steps
+
+
+def parse_binary_proof(data):
+    """
+    Returns the steps of a binary DRAT proof as a list of ('a' or 'd', clause)
+    """
+    steps = []
+    i = 0
+    while i < len(data):
+        kind = chr(data[i])
+        i += 1
+        clause = []
+        while data[i] != 0:
+            u, shift = 0, 0
+            while data[i] & 128:
+                u |= (data[i] & 127) << shift
+                shift += 7
+                i += 1
+            u |= data[i] << shift
+            i += 1
+            clause.append(-(u >> 1) if u & 1 else u >> 1)
+        i += 1
+        steps.append((kind, clause))
+    return steps
+
+
+def is_rup(clauses, lemma):
+    """
+    Returns whether unit propagation on clauses plus the negation of lemma reaches a conflict
+    """
+    assignment = {-l for l in lemma}
+    changed = True
+    while changed:
+        changed = False
+        for c in clauses:
+            if any(l in assignment for l in c):
+                continue
+            free = [l for l in c if -l not in assignment]
+            if len(free) == 0:
+                return True
+            if len(free) == 1:
+                assignment.add(free[0])
+                changed = True
+    return False
+
+
+class TestProof(unittest.TestCase):
+    def check_refutation(self, clauses, steps):
+        """
+        Checks (by reverse unit propagation only) that steps is a refutation of clauses
+        """
+        active = [list(c) for c in clauses]
+        for kind, clause in steps:
+            if kind == 'd':
+                active.remove(clause)
+            else:
+                self.assertTrue(is_rup(active, clause), clause)
+                active.append(clause)
+        self.assertEqual(('a', []), steps[-1])
+
+    def test_encode_binary_literal(self):
+        self.assertEqual(bytes([2]), proof.encode_binary_literal(1))
+        self.assertEqual(bytes([3]), proof.encode_binary_literal(-1))
+        self.assertEqual(bytes([0x7f]), proof.encode_binary_literal(-63))
+        self.assertEqual(bytes([0x80, 0x01]), proof.encode_binary_literal(64))
+        self.assertEqual(bytes([0x83, 0x80, 0x01]), proof.encode_binary_literal(-8193))
+
+    def test_writer_text_and_binary(self):
+        for binary in [False, True]:
+            sink = io.BytesIO()
+            writer = proof.DRATWriter(sink, binary=binary, buffer_size=4)
+            writer.add([1, -200])
+            writer.delete([1, -200])
+            writer.add([])
+            writer.close()
+            parse = parse_binary_proof if binary else parse_text_proof
+            self.assertEqual([('a', [1, -200]), ('d', [1, -200]), ('a', [])], parse(sink.getvalue()))
+
+        sink = io.BytesIO()
+        with proof.DRATWriter(sink) as writer:
+            writer.add([1, -2])
+        self.assertEqual(b'1 -2 0\n', sink.getvalue())
+
+    def test_dpll_proof_trivial_contradiction(self):
+        sink = io.BytesIO()
+        f = pysat.formula.CNF(from_clauses=[[1], [-1]])
+        self.assertIsNone(dpll.DPLL(formula=f, proof=sink).solve())
+        self.assertEqual(b'0\n', sink.getvalue())
+
+    def test_dpll_proof_file(self):
+        path = '/tmp/uuf50-01.drat'
+        f = pysat.formula.CNF(from_file='instances/uuf50-01.cnf')
+        self.assertIsNone(dpll.DPLL(formula=f, proof=path, backend='bitset').solve())
+        with open(path, 'rb') as proof_file:
+            self.check_refutation(f.clauses, parse_text_proof(proof_file.read()))
+        os.remove(path)
+
+    def test_dpll_proof_unsat20vars(self):
+        """
+        Checks the proofs of 100 UNSATisfiable random 3CNF instances with 20 vars,
+        alternating backends and proof formats
+        """
+        tmp_dir = '/tmp/unsat100_proof'
+        with tarfile.open('instances/3cnf_v20_unsat.tar.gz') as tf:
+            tf.extractall(tmp_dir)
+        for i, name in enumerate(os.listdir(tmp_dir)):
+            f = pysat.formula.CNF(from_file=os.path.join(tmp_dir, name))
+            sink = io.BytesIO()
+            binary = i % 2 == 0
+            solver = dpll.DPLL(formula=f, proof=sink, binary_proof=binary, backend='bitset' if i % 3 == 0 else 'cnf')
+            self.assertIsNone(solver.solve())
+            parse = parse_binary_proof if binary else parse_text_proof
+            self.check_refutation(f.clauses, parse(sink.getvalue()))
+        shutil.rmtree(tmp_dir)
+
+    def test_dpll_proof_native_constraints(self):
+        f = pysat.formula.CNF(from_clauses=[[1, 2]])
+        self.assertRaises(ValueError, dpll.DPLL, formula=f, at_most=[([1, 2], 1)], proof=io.BytesIO())
+
+
+if __name__ == '__main__':
+    unittest.main()